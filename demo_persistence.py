@@ -74,7 +74,7 @@ def demonstrate_persistence():
     # 3. Очищуємо поточну книгу
     print("\n3️⃣  Очищення поточної адресної книги:")
     original_count = len(book)
-    book.data.clear()
+    book.clear()
     print(f"   📝 Книга очищена (було {original_count} контактів, залишилось {len(book)})")
     
     # 4. Завантаження з файла
@@ -109,8 +109,8 @@ def demonstrate_persistence():
     test_contacts = ["Іван Петров", "Марія Коваленко", "Анна Мельник"]
     
     for contact_name in test_contacts:
-        if contact_name in loaded_book.data:
-            record = loaded_book.data[contact_name]
+        if contact_name in loaded_book:
+            record = loaded_book[contact_name]
             phones = [phone.value for phone in record.phones]
             if record.birthday:
                 if isinstance(record.birthday.value, str):
@@ -144,7 +144,7 @@ def demonstrate_persistence():
     
     # Завантажуємо та перевіряємо
     final_book = load_data(modified_file)
-    if "Тестовий Користувач" in final_book.data:
+    if "Тестовий Користувач" in final_book:
         print(f"   ✅ Новий контакт успішно збережено та завантажено")
         integrity_checks.append(True)
     else:
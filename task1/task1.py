@@ -9,9 +9,10 @@ This module extends the previous address book system with:
 - All previous functionality maintained (birthday management, CLI commands)
 
 Key Features:
-- save_data(): Serialize AddressBook to file using pickle
+- save_data(): Serialize AddressBook to file using pickle (Zstandard-compressed for .zst files)
 - load_data(): Deserialize AddressBook from file with error handling  
 - Automatic persistence integration in main loop
+- Persister: background saves after edits, keeping disk I/O out of the input loop
 - Graceful handling of missing/corrupted files
 - Maintains all contacts, phones, and birthdays between sessions
 
@@ -27,19 +28,74 @@ Commands supported (all from previous homework):
 - close/exit: Close program (with automatic save)
 """
 
-from collections import UserDict
-from datetime import datetime, timedelta
-from functools import wraps
+from array import array
+import calendar
+from datetime import date, datetime
+from functools import lru_cache, wraps
+import mmap
+from operator import itemgetter
 import re
 import pickle
+import pickletools
 import os
-from typing import List, Optional, Dict, Any
+import sys
+import threading
+import time
+from typing import List, Optional, Dict, Any, Callable, SupportsIndex, Tuple, Union
 
 
-def input_error(func):
+# Buffer size for address book file I/O, so a whole book is read/written in one go
+_IO_BUFFER_SIZE = 1 << 20
+
+# Files at least this large are memory-mapped on load instead of read()
+_MMAP_MIN_SIZE = 64 * 1024
+
+# Address book files with this suffix are Zstandard-compressed pickles
+_COMPRESSED_SUFFIX = ".zst"
+
+# Matches any non-digit character of a phone number
+_NON_DIGIT_RE = re.compile(r'\D')
+
+# Every byte except ASCII digits, for bytes.translate(None, ...) deletion
+_NON_DIGIT_BYTES = bytes(c for c in range(256) if not 0x30 <= c <= 0x39)
+
+# Unsaved edits are flushed in the background after this many changes or seconds
+_SAVE_EVERY_CHANGES = 16
+_SAVE_EVERY_SECONDS = 5.0
+
+# Prompt shown before reading a command
+_PROMPT = "Enter a command: "
+
+# Below this many birthdays the pure-Python scan beats NumPy setup overhead
+_VECTORIZE_MIN_BIRTHDAYS = 64
+
+
+@lru_cache(maxsize=None)
+def _numpy() -> Any:
+    """
+    Import NumPy on first use, or return None if it is not installed.
+    
+    NumPy is only needed for large address books, so it is kept out of
+    module import to avoid slowing down every bot start.
+    """
+    try:
+        import numpy
+    except ImportError:  # NumPy is optional; birthdays are then scanned in pure Python
+        return None
+    return numpy
+
+
+@lru_cache(maxsize=None)
+def _days_before_month() -> Any:
+    """NumPy array of days before the first of each month in a common year."""
+    np = _numpy()
+    return np.array([0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334], dtype=np.int64)
+
+
+def input_error(func: Callable[..., str]) -> Callable[..., str]:
     """Decorator for handling input errors with user-friendly messages."""
     @wraps(func)
-    def wrapper(*args, **kwargs):
+    def wrapper(*args: Any, **kwargs: Any) -> str:
         try:
             return func(*args, **kwargs)
         except KeyError as e:
@@ -57,6 +113,8 @@ def input_error(func):
 class Field:
     """Base class for record fields."""
     
+    __slots__ = ('value',)
+    
     def __init__(self, value: str):
         """Initialize field with value."""
         self.value = value
@@ -65,10 +123,21 @@ class Field:
         """Return string representation of field value."""
         return str(self.value)
 
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        """Pickle field as its constructor call with the raw value."""
+        return (type(self), (self.value,))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Load fields pickled before __slots__ were introduced ({'value': ...} state)."""
+        for key, value in state.items():
+            setattr(self, key, value)
+
 
 class Name(Field):
     """Class for storing contact name. Required field."""
     
+    __slots__ = ()
+    
     def __init__(self, value: str):
         """Initialize name field with validation."""
         if not value or not value.strip():
@@ -79,6 +148,8 @@ class Name(Field):
 class Phone(Field):
     """Class for storing phone number with format validation (10 digits)."""
     
+    __slots__ = ()
+    
     def __init__(self, value: str):
         """Initialize phone field with validation."""
         if not self._is_valid_phone(value):
@@ -88,50 +159,100 @@ class Phone(Field):
     @staticmethod
     def _is_valid_phone(phone: str) -> bool:
         """Validate phone number format (exactly 10 digits)."""
-        digits_only = re.sub(r'\D', '', phone)
-        return len(digits_only) == 10 and digits_only.isdigit()
+        if phone.isascii():
+            # Fast path for the common case of a bare 10-digit number
+            if len(phone) == 10 and phone.isdigit():
+                return True
+            # Drop separators with a single byte-table pass instead of the regex engine
+            return len(phone.encode('ascii').translate(None, _NON_DIGIT_BYTES)) == 10
+        # Non-ASCII input may contain Unicode digits, which \D handles
+        return len(_NON_DIGIT_RE.sub('', phone)) == 10
 
 
 class Birthday(Field):
     """Class for storing birthday with date validation (DD.MM.YYYY format)."""
     
+    __slots__ = ('date', 'month', 'day')
+    
     def __init__(self, value: str):
         """Initialize birthday field with date validation."""
+        # Only the date is stored; the DD.MM.YYYY string is built on demand
+        self.value = value
+
+    @classmethod
+    def _from_date(cls, birthday_date: date) -> "Birthday":
+        """Create birthday from an already validated date, skipping string parsing."""
+        birthday = cls.__new__(cls)
+        birthday._set_date(birthday_date)
+        return birthday
+
+    def _set_date(self, birthday_date: date) -> None:
+        """Store date along with month and day as ints for fast date arithmetic."""
+        self.date = birthday_date
+        self.month = birthday_date.month
+        self.day = birthday_date.day
+
+    @property
+    def value(self) -> str:
+        """Birthday in DD.MM.YYYY format."""
+        birthday_date = self.date
+        return f"{birthday_date.day:02d}.{birthday_date.month:02d}.{birthday_date.year:04d}"
+
+    @value.setter
+    def value(self, value: str) -> None:
+        """Parse and validate date format DD.MM.YYYY."""
         try:
-            # Parse and validate date format DD.MM.YYYY
-            parsed_date = datetime.strptime(value.strip(), "%d.%m.%Y")
-            # Store as datetime object for easy manipulation
-            self.date = parsed_date
-            # Store original string format for display
-            super().__init__(parsed_date.strftime("%d.%m.%Y"))
+            self._set_date(datetime.strptime(value.strip(), "%d.%m.%Y").date())
         except ValueError:
             raise ValueError("Invalid date format. Use DD.MM.YYYY")
 
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        """Pickle birthday as its date, so loading needs no string parsing."""
+        return (type(self)._from_date, (self.date,))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Load birthdays pickled with the old {'date': datetime, 'value': str} state."""
+        birthday_date = state["date"]
+        if isinstance(birthday_date, datetime):
+            birthday_date = birthday_date.date()
+        self._set_date(birthday_date)
+
+    def ordinal_in_year(self, year: int) -> int:
+        """Return date ordinal of this birthday in given year (29.02 falls on 28.02 in common years)."""
+        day = self.day
+        if self.month == 2 and day == 29 and not calendar.isleap(year):
+            day = 28
+        return date(year, self.month, day).toordinal()
+
 
 class Record:
     """Class for storing contact information including name, phones, and birthday."""
     
+    __slots__ = ('name', 'phones', 'birthday', '_by_value')
+    
     def __init__(self, name: str):
         """Initialize record with name and empty phone list."""
         self.name = Name(name)
         self.phones: List[Phone] = []
         self.birthday: Optional[Birthday] = None
+        # Index of phones by value; the list keeps display order
+        self._by_value: Dict[str, Phone] = {}
 
     def add_phone(self, phone: str) -> None:
         """Add phone number to the record."""
         phone_obj = Phone(phone)
         # Check if phone already exists
-        if any(p.value == phone_obj.value for p in self.phones):
+        if phone_obj.value in self._by_value:
             raise ValueError(f"Phone number {phone} already exists for this contact")
+        self._by_value[phone_obj.value] = phone_obj
         self.phones.append(phone_obj)
 
     def remove_phone(self, phone: str) -> None:
         """Remove phone number from the record."""
-        for i, p in enumerate(self.phones):
-            if p.value == phone:
-                self.phones.pop(i)
-                return
-        raise ValueError(f"Phone number {phone} not found")
+        phone_obj = self._by_value.pop(phone, None)
+        if phone_obj is None:
+            raise ValueError(f"Phone number {phone} not found")
+        self.phones.remove(phone_obj)
 
     def edit_phone(self, old_phone: str, new_phone: str) -> None:
         """Edit existing phone number."""
@@ -139,18 +260,19 @@ class Record:
         new_phone_obj = Phone(new_phone)
         
         # Find and replace the phone
-        for p in self.phones:
-            if p.value == old_phone:
-                p.value = new_phone_obj.value
-                return
-        raise ValueError(f"Phone number {old_phone} not found")
+        phone_obj = self._by_value.get(old_phone)
+        if phone_obj is None:
+            raise ValueError(f"Phone number {old_phone} not found")
+        if new_phone_obj.value != old_phone and new_phone_obj.value in self._by_value:
+            raise ValueError(f"Phone number {new_phone} already exists for this contact")
+        del self._by_value[old_phone]
+        phone_obj.value = new_phone_obj.value
+        self._by_value[phone_obj.value] = phone_obj
 
     def find_phone(self, phone: str) -> Optional[str]:
         """Find phone number in the record."""
-        for p in self.phones:
-            if p.value == phone:
-                return p.value
-        return None
+        phone_obj = self._by_value.get(phone)
+        return phone_obj.value if phone_obj else None
 
     def add_birthday(self, birthday: str) -> None:
         """Add birthday to the record."""
@@ -162,13 +284,35 @@ class Record:
             return None
         
         today = datetime.now().date()
-        birthday_this_year = self.birthday.date.replace(year=today.year).date()
+        today_ordinal = today.toordinal()
+        birthday_ordinal = self.birthday.ordinal_in_year(today.year)
         
         # If birthday already passed this year, calculate for next year
-        if birthday_this_year < today:
-            birthday_this_year = self.birthday.date.replace(year=today.year + 1).date()
+        if birthday_ordinal < today_ordinal:
+            birthday_ordinal = self.birthday.ordinal_in_year(today.year + 1)
         
-        return (birthday_this_year - today).days
+        return birthday_ordinal - today_ordinal
+
+    def __getstate__(self) -> Tuple[str, List[str], Optional[int]]:
+        """Return compact pickle state: name, phone values and birthday date ordinal."""
+        return (
+            self.name.value,
+            [p.value for p in self.phones],
+            self.birthday.date.toordinal() if self.birthday else None,
+        )
+
+    def __setstate__(self, state: Union[Dict[str, Any], Tuple[str, List[str], Optional[int]]]) -> None:
+        """Rebuild record fields from pickle state."""
+        if isinstance(state, dict):
+            # Files saved before compact state was introduced
+            for key, value in state.items():
+                setattr(self, key, value)
+        else:
+            name, phones, birthday = state
+            self.name = Name(name)
+            self.phones = [Phone(phone) for phone in phones]
+            self.birthday = Birthday._from_date(date.fromordinal(birthday)) if birthday is not None else None
+        self._by_value = {p.value: p for p in self.phones}
 
     def __str__(self) -> str:
         """Return string representation of the record."""
@@ -179,65 +323,207 @@ class Record:
         return result
 
 
-class AddressBook(UserDict):
+class AddressBook(Dict[str, Record]):
     """Class for storing and managing contact records with birthday functionality and persistence."""
     
+    # Unsaved-changes tracking for periodic saves (not pickled)
+    _dirty = False
+    _changes = 0
+    
+    @classmethod
+    def _from_columns(cls, names: List[str], birthdays: List[Optional[int]],
+                      phone_counts: "array[int]", phone_lengths: "array[int]",
+                      phone_blob: Union[bytes, pickle.PickleBuffer]) -> "AddressBook":
+        """Rebuild address book from column-wise pickle state."""
+        book = cls()
+        blob = memoryview(phone_blob)
+        lengths = iter(phone_lengths)
+        offset = 0
+        for name, birthday, count in zip(names, birthdays, phone_counts):
+            phones: List[str] = []
+            for _ in range(count):
+                end = offset + next(lengths)
+                phones.append(str(blob[offset:end], "utf-8"))
+                offset = end
+            record = Record.__new__(Record)
+            record.__setstate__((name, phones, birthday))
+            book[name] = record
+        return book
+
+    def __reduce_ex__(self, protocol: SupportsIndex) -> Tuple[Any, ...]:
+        """
+        Pickle address book column-wise instead of as a dict of records.
+
+        Names and birthdays go into plain lists, while all phone numbers are
+        packed into one contiguous buffer with per-record counts and per-phone
+        byte lengths, so a book serializes to a few large opcodes. The buffer
+        is wrapped in PickleBuffer only for protocol 5+, which supports it.
+        """
+        names: List[str] = []
+        birthdays: List[Optional[int]] = []
+        phone_counts = array("I")
+        phone_lengths = array("I")
+        encoded_phones: List[bytes] = []
+        for record in self.values():
+            names.append(record.name.value)
+            birthdays.append(record.birthday.date.toordinal() if record.birthday else None)
+            phone_counts.append(len(record.phones))
+            for phone in record.phones:
+                encoded = phone.value.encode("utf-8")
+                phone_lengths.append(len(encoded))
+                encoded_phones.append(encoded)
+        phone_blob: Union[bytes, pickle.PickleBuffer] = b"".join(encoded_phones)
+        if int(protocol) >= 5:
+            phone_blob = pickle.PickleBuffer(phone_blob)
+        return (type(self)._from_columns, (names, birthdays, phone_counts, phone_lengths, phone_blob))
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Load files saved while AddressBook was a UserDict ({'data': {...}} state)."""
+        self.update(state.get("data", {}))
+
+    @property
+    def data(self) -> "AddressBook":
+        """Backward-compatible alias for code written against the UserDict API."""
+        return self
+
+    def copy(self) -> "AddressBook":
+        """Return a shallow copy that is still an AddressBook, as UserDict.copy() did."""
+        return type(self)(self)
+
+    def __copy__(self) -> "AddressBook":
+        """Shallow copy sharing the records, instead of a round trip through the column-wise reducer."""
+        return self.copy()
+
+    def __or__(self, other: Any) -> "AddressBook":  # type: ignore[override]
+        """Return merged copy of the book, keeping the AddressBook type like UserDict did."""
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = self.copy()
+        merged.update(other)
+        return merged
+
+    def __ror__(self, other: Any) -> "AddressBook":  # type: ignore[override]
+        """Return merged copy with another mapping on the left, keeping the AddressBook type."""
+        if not isinstance(other, dict):
+            return NotImplemented
+        merged = type(self)(other)
+        merged.update(self)
+        return merged
+
+    def mark_dirty(self) -> None:
+        """Note an unsaved change to the book or one of its records."""
+        self._dirty = True
+        self._changes += 1
+
+    def mark_clean(self) -> None:
+        """Note that the current state of the book has been saved."""
+        self._dirty = False
+        self._changes = 0
+
+    def needs_save(self, now: float, last_save: float) -> bool:
+        """Check if unsaved edits piled up or have waited long enough since the last save (monotonic times)."""
+        return self._dirty and (self._changes >= _SAVE_EVERY_CHANGES
+                                or now - last_save >= _SAVE_EVERY_SECONDS)
+
     def add_record(self, record: Record) -> None:
         """Add record to address book."""
-        if record.name.value in self.data:
+        if record.name.value in self:
             raise ValueError(f"Contact {record.name.value} already exists")
-        self.data[record.name.value] = record
+        self[record.name.value] = record
+        self.mark_dirty()
 
     def find(self, name: str) -> Optional[Record]:
         """Find record by name."""
-        return self.data.get(name)
+        return self.get(name)
 
     def delete(self, name: str) -> None:
         """Delete record by name."""
-        if name not in self.data:
+        if name not in self:
             raise ValueError(f"Contact {name} not found")
-        del self.data[name]
+        del self[name]
+        self.mark_dirty()
 
     def get_upcoming_birthdays(self) -> List[Dict[str, str]]:
         """Get list of contacts with upcoming birthdays in the next 7 days."""
         today = datetime.now().date()
-        upcoming_birthdays = []
+        today_ordinal = today.toordinal()
+        dated = [(record.name.value, record.birthday) for record in self.values() if record.birthday]
         
-        for record in self.data.values():
-            if not record.birthday:
-                continue
+        if len(dated) >= _VECTORIZE_MIN_BIRTHDAYS and _numpy() is not None:
+            upcoming = _upcoming_birthdays_vectorized(dated, today)
+        else:
+            # (congratulation date ordinal, name) pairs, formatted only after sorting
+            upcoming = []
+            for name, birthday in dated:
+                # Get birthday for this year
+                birthday_ordinal = birthday.ordinal_in_year(today.year)
                 
-            # Get birthday for this year
-            birthday_this_year = record.birthday.date.replace(year=today.year).date()
-            
-            # If birthday already passed this year, check next year
-            if birthday_this_year < today:
-                birthday_this_year = record.birthday.date.replace(year=today.year + 1).date()
-            
-            # Check if birthday is within next 7 days
-            days_until = (birthday_this_year - today).days
-            if 0 <= days_until <= 7:
-                # Adjust for weekends - move to Monday
-                congratulation_date = birthday_this_year
-                if congratulation_date.weekday() >= 5:  # Saturday = 5, Sunday = 6
-                    # Move to next Monday
-                    days_to_monday = 7 - congratulation_date.weekday()
-                    congratulation_date += timedelta(days=days_to_monday)
+                # If birthday already passed this year, check next year
+                if birthday_ordinal < today_ordinal:
+                    birthday_ordinal = birthday.ordinal_in_year(today.year + 1)
                 
-                upcoming_birthdays.append({
-                    "name": record.name.value,
-                    "congratulation_date": congratulation_date.strftime("%d.%m.%Y")
-                })
+                # Check if birthday is within next 7 days
+                days_until = birthday_ordinal - today_ordinal
+                if 0 <= days_until <= 7:
+                    # Adjust for weekends - move to Monday (ordinal 1 is a Monday)
+                    weekday = (birthday_ordinal - 1) % 7
+                    if weekday >= 5:  # Saturday = 5, Sunday = 6
+                        birthday_ordinal += 7 - weekday
+                    
+                    upcoming.append((birthday_ordinal, name))
         
         # Sort by congratulation date
-        upcoming_birthdays.sort(key=lambda x: datetime.strptime(x["congratulation_date"], "%d.%m.%Y"))
-        return upcoming_birthdays
+        upcoming.sort(key=itemgetter(0))
+        return [
+            {
+                "name": name,
+                "congratulation_date": date.fromordinal(ordinal).strftime("%d.%m.%Y")
+            }
+            for ordinal, name in upcoming
+        ]
 
     def __str__(self) -> str:
         """Return string representation of address book."""
-        if not self.data:
+        if not self:
             return "Address book is empty"
-        return "\n".join(str(record) for record in self.data.values())
+        return "\n".join(str(record) for record in self.values())
+
+
+def _birthday_ordinals_vectorized(year: int, months: Any, days: Any) -> Any:
+    """Vectorized Birthday.ordinal_in_year() over arrays of months and days."""
+    np = _numpy()
+    leap = calendar.isleap(year)
+    if not leap:
+        days = np.where((months == 2) & (days == 29), 28, days)
+    days_before_month = _days_before_month()[months - 1] + (leap & (months > 2))
+    return date(year, 1, 1).toordinal() + days_before_month + days - 1
+
+
+def _upcoming_birthdays_vectorized(dated: List[Tuple[str, Birthday]], today: date) -> List[Tuple[int, str]]:
+    """
+    NumPy version of the upcoming-birthday scan for large address books.
+    
+    Birthday months and days are gathered into int16 arrays and the whole
+    book is filtered and weekend-shifted in a few array operations.
+    Returns (congratulation date ordinal, name) pairs in book order.
+    """
+    np = _numpy()
+    today_ordinal = today.toordinal()
+    months = np.fromiter((birthday.month for _, birthday in dated), dtype=np.int16, count=len(dated))
+    days = np.fromiter((birthday.day for _, birthday in dated), dtype=np.int16, count=len(dated))
+    
+    ordinals = _birthday_ordinals_vectorized(today.year, months, days)
+    # Birthdays already passed this year are taken from next year
+    next_year = _birthday_ordinals_vectorized(today.year + 1, months, days)
+    ordinals = np.where(ordinals < today_ordinal, next_year, ordinals)
+    
+    selected = np.flatnonzero(ordinals - today_ordinal <= 7)
+    ordinals = ordinals[selected]
+    # Adjust for weekends - move to Monday (ordinal 1 is a Monday)
+    weekdays = (ordinals - 1) % 7
+    ordinals = np.where(weekdays >= 5, ordinals + 7 - weekdays, ordinals)
+    
+    return [(int(ordinal), dated[i][0]) for i, ordinal in zip(selected.tolist(), ordinals)]
 
 
 # Persistent data management functions
@@ -246,6 +532,12 @@ def save_data(book: AddressBook, filename: str = "addressbook.pkl") -> bool:
     """
     Save AddressBook to file using pickle serialization.
     
+    The book is written to a temporary file next to the target, flushed to
+    disk and then atomically renamed over it, so an interrupted save never
+    leaves a half-written file behind. Missing parent directories are created.
+    Filenames ending in .zst (e.g. addressbook.pkl.zst) are Zstandard-compressed,
+    which requires the optional zstandard package.
+    
     Args:
         book: AddressBook instance to save
         filename: File path to save to (default: addressbook.pkl)
@@ -254,21 +546,79 @@ def save_data(book: AddressBook, filename: str = "addressbook.pkl") -> bool:
         bool: True if save successful, False otherwise
     """
     try:
-        with open(filename, "wb") as f:
-            pickle.dump(book, f)
+        payload = _dump_book(book, filename)
+    except pickle.PickleError as e:
+        print(f"Error saving data to {filename}: {e}")
+        return False
+    except Exception as e:
+        print(f"Unexpected error saving data: {e}")
+        return False
+    return _write_payload(payload, filename)
+
+
+def _dump_book(book: AddressBook, filename: str) -> bytes:
+    """Serialize AddressBook to file contents, compressed if filename asks for it."""
+    return _encode_payload(pickle.dumps(book, protocol=pickle.HIGHEST_PROTOCOL), filename)
+
+
+def _encode_payload(pickled: bytes, filename: str) -> bytes:
+    """Turn a raw pickle into file contents, compressed if filename asks for it."""
+    # Strip redundant memo PUT opcodes before writing the highest-protocol pickle
+    payload = pickletools.optimize(pickled)
+    if filename.endswith(_COMPRESSED_SUFFIX):
+        payload = _require_zstandard().ZstdCompressor(level=3).compress(payload)
+    return payload
+
+
+@lru_cache(maxsize=None)
+def _require_zstandard() -> Any:
+    """
+    Import zstandard on first use, or raise if the optional package is not installed.
+    
+    Only compressed .zst files need it, so it is kept out of module import
+    like NumPy in _numpy().
+    """
+    try:
+        import zstandard
+    except ImportError:  # Zstandard is optional; only needed for compressed .zst files
+        raise RuntimeError(f"Package 'zstandard' is required for {_COMPRESSED_SUFFIX} files") from None
+    return zstandard
+
+
+def _write_payload(payload: bytes, filename: str) -> bool:
+    """Atomically write pickled payload to file via temp file, fsync and rename."""
+    tmp_filename = filename + ".tmp"
+    try:
+        directory = os.path.dirname(filename)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(tmp_filename, "wb", buffering=_IO_BUFFER_SIZE) as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_filename, filename)
         return True
-    except (IOError, OSError, pickle.PickleError) as e:
+    except (IOError, OSError) as e:
         print(f"Error saving data to {filename}: {e}")
         return False
     except Exception as e:
         print(f"Unexpected error saving data: {e}")
         return False
+    finally:
+        # Drop leftover temporary file if the save failed part way
+        if os.path.exists(tmp_filename):
+            try:
+                os.remove(tmp_filename)
+            except OSError:
+                pass
 
 
 def load_data(filename: str = "addressbook.pkl") -> AddressBook:
     """
     Load AddressBook from file using pickle deserialization.
     
+    Filenames ending in .zst are decompressed with Zstandard first.
+    
     Args:
         filename: File path to load from (default: addressbook.pkl)
     
@@ -276,8 +626,16 @@ def load_data(filename: str = "addressbook.pkl") -> AddressBook:
         AddressBook: Loaded address book or new empty one if file not found/corrupted
     """
     try:
-        with open(filename, "rb") as f:
-            book = pickle.load(f)
+        with open(filename, "rb", buffering=_IO_BUFFER_SIZE) as f:
+            if filename.endswith(_COMPRESSED_SUFFIX):
+                book = pickle.loads(_require_zstandard().ZstdDecompressor().decompress(f.read()))
+            elif os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                # Small books: one read() is cheaper than setting up a mapping
+                book = pickle.loads(f.read())
+            else:
+                # Large books: unpickle straight from the page cache, no read() copies
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    book = pickle.loads(mapped)
             # Verify loaded object is AddressBook instance
             if isinstance(book, AddressBook):
                 return book
@@ -300,9 +658,96 @@ def load_data(filename: str = "addressbook.pkl") -> AddressBook:
         return AddressBook()
 
 
+class Persister:
+    """
+    Background writer that keeps file I/O out of the bot's input loop.
+    
+    submit() only pickles the book on the caller's thread, so later edits
+    cannot race with serialization, and hands the raw bytes to a worker
+    thread. The worker optimizes and (for .zst files) compresses them, then
+    performs the atomic write and fsync. If several saves are queued before
+    the worker gets to them, only the newest one is encoded and written.
+    
+    When created with a book, the worker also wakes up on its own once
+    _SAVE_EVERY_SECONDS have passed since the last save and snapshots unsaved
+    edits itself, so an idle bot does not keep them in memory indefinitely.
+    Code that edits the book must hold `lock` while doing so.
+    """
+    
+    def __init__(self, filename: str = "addressbook.pkl", book: Optional[AddressBook] = None) -> None:
+        """Start worker thread writing to the given file, optionally watching book for unsaved edits."""
+        self.filename = filename
+        self.book = book
+        # Held by the input loop while a command edits the book, and by the worker while it snapshots it
+        self.lock = threading.Lock()
+        self.last_save = time.monotonic()
+        self._condition = threading.Condition()
+        self._pending: Optional[bytes] = None
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="addressbook-persister", daemon=True)
+        self._worker.start()
+
+    def submit(self, book: AddressBook) -> bool:
+        """Queue a snapshot of the book for saving. Returns False if it cannot be serialized."""
+        try:
+            pickled = pickle.dumps(book, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            print(f"Error saving data to {self.filename}: {e}")
+            return False
+        with self._condition:
+            self._pending = pickled
+            self._condition.notify()
+        return True
+
+    def save_if_needed(self) -> None:
+        """Submit the watched book if it needs saving. Call with `lock` held."""
+        if self.book is None:
+            return
+        now = time.monotonic()
+        if self.book.needs_save(now, self.last_save):
+            if self.submit(self.book):
+                self.book.mark_clean()
+            self.last_save = now
+
+    def close(self) -> None:
+        """Write any queued snapshot and stop the worker thread."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._worker.join()
+
+    def _run(self) -> None:
+        """Worker loop: encode and write the latest queued snapshot until closed."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    if self.book is None:
+                        self._condition.wait()
+                        continue
+                    # Sleep until the oldest unsaved edit may be due, see needs_save()
+                    timeout = self.last_save + _SAVE_EVERY_SECONDS - time.monotonic()
+                    if not self._condition.wait(timeout if timeout > 0 else _SAVE_EVERY_SECONDS):
+                        break
+                pickled, self._pending = self._pending, None
+                closed = self._closed
+            if pickled is None:
+                if closed:
+                    return
+                # Timed out: snapshot edits made since the last save while the input loop is idle
+                with self.lock:
+                    self.save_if_needed()
+                continue
+            try:
+                payload = _encode_payload(pickled, self.filename)
+            except Exception as e:
+                print(f"Error saving data to {self.filename}: {e}")
+                continue
+            _write_payload(payload, self.filename)
+
+
 # Bot command functions (unchanged from previous homework)
 
-def parse_input(user_input: str) -> tuple:
+def parse_input(user_input: str) -> Tuple[str, List[str]]:
     """Parse user input into command and arguments."""
     parts = user_input.strip().split()
     command = parts[0].lower() if parts else ""
@@ -324,9 +769,12 @@ def add_contact(args: List[str], book: AddressBook) -> str:
         record = Record(name)
         book.add_record(record)
         message = "Contact added."
-    
-    if phone:
+        if phone:
+            # Already counted as one change by add_record()
+            record.add_phone(phone)
+    elif phone:
         record.add_phone(phone)
+        book.mark_dirty()
     
     return message
 
@@ -344,6 +792,7 @@ def change_contact(args: List[str], book: AddressBook) -> str:
         raise KeyError(name)
     
     record.edit_phone(old_phone, new_phone)
+    book.mark_dirty()
     return "Contact updated."
 
 
@@ -369,7 +818,7 @@ def show_phone(args: List[str], book: AddressBook) -> str:
 @input_error
 def show_all(args: List[str], book: AddressBook) -> str:
     """Show all contacts in address book."""
-    if not book.data:
+    if not book:
         return "No contacts in address book."
     
     return str(book)
@@ -388,6 +837,7 @@ def add_birthday(args: List[str], book: AddressBook) -> str:
         raise KeyError(name)
     
     record.add_birthday(birthday)
+    book.mark_dirty()
     return f"Birthday added for {name}."
 
 
@@ -424,26 +874,70 @@ def birthdays(args: List[str], book: AddressBook) -> str:
     return result.rstrip()
 
 
-def main():
+# Address book commands: name -> handler(args, book) returning the reply text
+_COMMAND_HANDLERS: Dict[str, Callable[[List[str], AddressBook], str]] = {
+    "add": add_contact,
+    "change": change_contact,
+    "phone": show_phone,
+    "all": show_all,
+    "add-birthday": add_birthday,
+    "show-birthday": show_birthday,
+    "birthdays": birthdays,
+}
+
+
+def _read_tty_command() -> str:
+    """Prompt for and read next command line from an interactive terminal."""
+    return input(_PROMPT)
+
+
+def _read_piped_command() -> str:
+    """Read next command line from non-interactive stdin, raising EOFError at end of input."""
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line
+
+
+def main() -> None:
     """Main bot loop with command processing and persistent data management."""
     # Load existing data or create new address book
     filename = "addressbook.pkl"
     book = load_data(filename)
     
     # Show status message about loaded data
-    if book.data:
-        print(f"Welcome back! Loaded {len(book.data)} contacts from previous session.")
+    if book:
+        print(f"Welcome back! Loaded {len(book)} contacts from previous session.")
     else:
         print("Welcome to the assistant bot!")
     
+    # Intermediate saves of edits are written in the background
+    persister = Persister(filename, book)
+    
+    # Piped/scripted input skips the readline machinery of input() and gets the prompt only once
+    read_command: Callable[[], str]
+    if sys.stdin.isatty():
+        read_command = _read_tty_command
+    else:
+        print(_PROMPT, end="", flush=True)
+        read_command = _read_piped_command
+    
     try:
         while True:
             try:
-                user_input = input("Enter a command: ")
+                user_input = read_command()
                 command, args = parse_input(user_input)
 
-                if command in ["close", "exit"]:
+                handler = _COMMAND_HANDLERS.get(command)
+                if handler is not None:
+                    with persister.lock:
+                        print(handler(args, book))
+                        # Flush edits in the background once enough have piled up or enough time has passed
+                        persister.save_if_needed()
+
+                elif command in ["close", "exit"]:
                     # Save data before exiting
+                    persister.close()
                     if save_data(book, filename):
                         print("Data saved successfully.")
                     else:
@@ -454,33 +948,13 @@ def main():
                 elif command == "hello":
                     print("How can I help you?")
 
-                elif command == "add":
-                    print(add_contact(args, book))
-
-                elif command == "change":
-                    print(change_contact(args, book))
-
-                elif command == "phone":
-                    print(show_phone(args, book))
-
-                elif command == "all":
-                    print(show_all(args, book))
-
-                elif command == "add-birthday":
-                    print(add_birthday(args, book))
-
-                elif command == "show-birthday":
-                    print(show_birthday(args, book))
-
-                elif command == "birthdays":
-                    print(birthdays(args, book))
-
                 else:
                     print("Invalid command.")
             
             except KeyboardInterrupt:
                 # Save data on Ctrl+C
                 print("\nSaving data before exit...")
+                persister.close()
                 if save_data(book, filename):
                     print("Data saved successfully.")
                 else:
@@ -490,6 +964,7 @@ def main():
             except EOFError:
                 # Save data on EOF
                 print("\nSaving data before exit...")
+                persister.close()
                 if save_data(book, filename):
                     print("Data saved successfully.")
                 else:
@@ -500,6 +975,7 @@ def main():
         # Emergency save on unexpected error
         print(f"\nUnexpected error occurred: {e}")
         print("Attempting to save data...")
+        persister.close()
         if save_data(book, filename):
             print("Data saved successfully.")
         else:
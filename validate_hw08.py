@@ -8,164 +8,226 @@
 4. Інтеграція в основний цикл програми
 """
 
+import io
 import sys
-import os
-import inspect
-import importlib.util
+from contextlib import redirect_stdout
+from functools import lru_cache
 from pathlib import Path
 import ast
+import re
 
-def validate_hw08():
-    """Перевіряє виконання всіх вимог домашнього завдання 08"""
-    
-    print("🔍 Перевірка домашнього завдання 08: Збереження даних")
-    print("=" * 60)
-    
-    # Шлях до файлу завдання
-    task_file = Path(__file__).parent / "task1" / "task1.py"
-    
-    if not task_file.exists():
-        print("❌ Файл task1/task1.py не знайдено!")
-        return False
-    
-    # Завантаження модуля
-    spec = importlib.util.spec_from_file_location("task1", task_file)
-    task_module = importlib.util.module_from_spec(spec)
-    
-    try:
-        spec.loader.exec_module(task_module)
-    except Exception as e:
-        print(f"❌ Помилка при завантаженні модуля: {e}")
+# Токени pickle та обробників помилок, які шукаються у файлі завдання
+_TOKEN_RE = re.compile(
+    r'import pickle|from pickle import|pickle\.dump|pickle\.load'
+    r'|FileNotFoundError|PermissionError|pickle\.PickleError'
+)
+
+_REQUIRED_COMMANDS = frozenset(('add', 'change', 'phone', 'all', 'add-birthday', 'show-birthday', 'birthdays'))
+_REQUIRED_CLASSES = frozenset(('AddressBook', 'Record', 'Name', 'Phone', 'Birthday'))
+_ERROR_HANDLERS = ('FileNotFoundError', 'PermissionError', 'pickle.PickleError')
+
+# Незмінні рядки виводу
+_SEP = "=" * 60
+_HEADERS = (
+    "\n1️⃣  Перевірка функції save_data():",
+    "\n2️⃣  Перевірка функції load_data():",
+    "\n3️⃣  Перевірка використання протоколу pickle:",
+    "\n4️⃣  Перевірка обробки помилок:",
+    "\n5️⃣  Перевірка інтеграції в основний цикл:",
+    "\n6️⃣  Перевірка зворотної сумісності:",
+    "\n7️⃣  Перевірка CLI команд:",
+)
+
+# Рядкові літерали, що точно дорівнюють одній із команд ("call" не зараховується як "all")
+_COMMAND_RE = re.compile(
+    r'(["\'])(' + '|'.join(map(re.escape, sorted(_REQUIRED_COMMANDS, key=len, reverse=True))) + r')\1'
+)
+
+
+@lru_cache(maxsize=4)
+def _load(path_str, mtime_ns):
+    """Читає й розбирає файл завдання; mtime_ns у ключі кешу скидає його після редагування"""
+    raw = Path(path_str).read_bytes()
+    return raw.decode('utf-8'), ast.parse(raw, filename=path_str)
+
+
+def _check_save_data(top_level_defs):
+    """1. Перевірка функції save_data"""
+    print(_HEADERS[0])
+    save_func = top_level_defs.get('save_data')
+    if not isinstance(save_func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        print("   ❌ Функція save_data() не знайдена")
         return False
     
-    results = []
-    
-    # 1. Перевірка функції save_data
-    print("\n1️⃣  Перевірка функції save_data():")
-    if hasattr(task_module, 'save_data'):
-        save_func = getattr(task_module, 'save_data')
-        sig = inspect.signature(save_func)
-        params = list(sig.parameters.keys())
-        
-        # Перевіряємо параметри
-        if 'book' in params:
-            print("   ✅ Функція save_data() знайдена з правильними параметрами")
-            results.append(True)
-        else:
-            print("   ❌ Функція save_data() має неправильні параметри")
-            results.append(False)
-    else:
-        print("   ❌ Функція save_data() не знайдена")
-        results.append(False)
+    save_args = save_func.args
+    params = [arg.arg for arg in save_args.posonlyargs + save_args.args + save_args.kwonlyargs]
     
-    # 2. Перевірка функції load_data
-    print("\n2️⃣  Перевірка функції load_data():")
-    if hasattr(task_module, 'load_data'):
-        load_func = getattr(task_module, 'load_data')
+    # Перевіряємо параметри
+    if 'book' in params:
+        print("   ✅ Функція save_data() знайдена з правильними параметрами")
+        return True
+    print("   ❌ Функція save_data() має неправильні параметри")
+    return False
+
+
+def _check_load_data(top_level_defs):
+    """2. Перевірка функції load_data"""
+    print(_HEADERS[1])
+    if isinstance(top_level_defs.get('load_data'), (ast.FunctionDef, ast.AsyncFunctionDef)):
         print("   ✅ Функція load_data() знайдена")
-        results.append(True)
-    else:
-        print("   ❌ Функція load_data() не знайдена")
-        results.append(False)
-    
-    # 3. Перевірка використання pickle
-    print("\n3️⃣  Перевірка використання протоколу pickle:")
-    with open(task_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    if 'import pickle' in content or 'from pickle import' in content:
-        print("   ✅ Протокол pickle імпортований")
-        if 'pickle.dump' in content and 'pickle.load' in content:
-            print("   ✅ Використовуються функції pickle.dump() та pickle.load()")
-            results.append(True)
-        else:
-            print("   ❌ Не всі необхідні функції pickle використовуються")
-            results.append(False)
-    else:
+        return True
+    print("   ❌ Функція load_data() не знайдена")
+    return False
+
+
+def _check_pickle(tokens):
+    """3. Перевірка використання pickle"""
+    print(_HEADERS[2])
+    if 'import pickle' not in tokens and 'from pickle import' not in tokens:
         print("   ❌ Протокол pickle не імпортований")
-        results.append(False)
-    
-    # 4. Перевірка обробки помилок
-    print("\n4️⃣  Перевірка обробки помилок:")
-    error_handlers = ['FileNotFoundError', 'PermissionError', 'pickle.PickleError']
-    found_handlers = []
+        return False
     
-    for handler in error_handlers:
-        if handler in content:
-            found_handlers.append(handler)
+    print("   ✅ Протокол pickle імпортований")
+    if 'pickle.dump' in tokens and 'pickle.load' in tokens:
+        print("   ✅ Використовуються функції pickle.dump() та pickle.load()")
+        return True
+    print("   ❌ Не всі необхідні функції pickle використовуються")
+    return False
+
+
+def _check_error_handling(tokens):
+    """4. Перевірка обробки помилок"""
+    print(_HEADERS[3])
+    found_handlers = [handler for handler in _ERROR_HANDLERS if handler in tokens]
     
     if len(found_handlers) >= 2:
         print(f"   ✅ Знайдено обробку помилок: {', '.join(found_handlers)}")
-        results.append(True)
-    else:
-        print(f"   ⚠️  Знайдено лише частину обробників помилок: {', '.join(found_handlers)}")
-        results.append(len(found_handlers) > 0)
-    
-    # 5. Перевірка інтеграції в main()
-    print("\n5️⃣  Перевірка інтеграції в основний цикл:")
-    if hasattr(task_module, 'main'):
-        main_source = inspect.getsource(task_module.main)
-        if 'load_data' in main_source and 'save_data' in main_source:
-            print("   ✅ Функції збереження/завантаження інтегровані в main()")
-            results.append(True)
-        else:
-            print("   ❌ Функції не інтегровані в main()")
-            results.append(False)
-    else:
+        return True
+    print(f"   ⚠️  Знайдено лише частину обробників помилок: {', '.join(found_handlers)}")
+    return len(found_handlers) > 0
+
+
+def _check_main(top_level_defs):
+    """5. Перевірка інтеграції в main()"""
+    print(_HEADERS[4])
+    if 'main' not in top_level_defs:
         print("   ❌ Функція main() не знайдена")
-        results.append(False)
-    
-    # 6. Перевірка зворотної сумісності
-    print("\n6️⃣  Перевірка зворотної сумісності:")
-    required_classes = ['AddressBook', 'Record', 'Name', 'Phone', 'Birthday']
-    missing_classes = []
+        return False
     
-    for cls_name in required_classes:
-        if not hasattr(task_module, cls_name):
-            missing_classes.append(cls_name)
+    # Імена, на які посилається main(): як прості виклики, так і через атрибут (module.save_data)
+    used_names = set()
+    for node in ast.walk(top_level_defs['main']):
+        if isinstance(node, ast.Name):
+            used_names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            used_names.add(node.attr)
+    
+    if 'load_data' in used_names and 'save_data' in used_names:
+        print("   ✅ Функції збереження/завантаження інтегровані в main()")
+        return True
+    print("   ❌ Функції не інтегровані в main()")
+    return False
+
+
+def _check_classes(top_level_defs):
+    """6. Перевірка зворотної сумісності"""
+    print(_HEADERS[5])
+    missing_classes = [
+        cls_name for cls_name in sorted(_REQUIRED_CLASSES)
+        if not isinstance(top_level_defs.get(cls_name), ast.ClassDef)
+    ]
     
     if not missing_classes:
         print("   ✅ Всі необхідні класи присутні")
-        results.append(True)
-    else:
-        print(f"   ❌ Відсутні класи: {', '.join(missing_classes)}")
-        results.append(False)
+        return True
+    print(f"   ❌ Відсутні класи: {', '.join(missing_classes)}")
+    return False
+
+
+def _check_commands(content):
+    """7. Перевірка CLI команд"""
+    print(_HEADERS[6])
+    found_commands = {command for _, command in _COMMAND_RE.findall(content)}
     
-    # 7. Перевірка CLI команд
-    print("\n7️⃣  Перевірка CLI команд:")
-    required_commands = ['add', 'change', 'phone', 'all', 'add-birthday', 'show-birthday', 'birthdays']
+    if len(found_commands) >= 5:
+        print(f"   ✅ Знайдено команди: {', '.join(found_commands)}")
+        return True
+    print(f"   ⚠️  Знайдено лише частину команд: {', '.join(found_commands)}")
+    return len(found_commands) > 3
+
+
+def validate_hw08(fail_fast=False):
+    """Перевіряє виконання всіх вимог домашнього завдання 08
+    
+    З fail_fast=True перевірка зупиняється, щойно оцінка ВІДМІННО стає недосяжною.
+    """
+    # Вивід накопичується в буфері й записується одним викликом write,
+    # у тому числі при достроковому виході
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            return _validate(fail_fast)
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+
+
+def _validate(fail_fast):
+    """Виконує всі перевірки та друкує підсумок (вивід збирає validate_hw08)"""
+    print("🔍 Перевірка домашнього завдання 08: Збереження даних")
+    print(_SEP)
     
-    # Аналіз AST для пошуку команд
-    tree = ast.parse(content)
-    found_commands = []
+    # Шлях до файлу завдання
+    task_file = Path(__file__).parent / "task1" / "task1.py"
     
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Str):
-            for cmd in required_commands:
-                if cmd in node.s:
-                    found_commands.append(cmd)
-        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
-            for cmd in required_commands:
-                if cmd in node.value:
-                    found_commands.append(cmd)
+    if not task_file.exists():
+        print("❌ Файл task1/task1.py не знайдено!")
+        return False
     
-    found_commands = list(set(found_commands))  # Унікальні значення
+    # Статичний аналіз модуля: файл читається й розбирається один раз для всіх перевірок,
+    # код завдання не виконується
+    try:
+        content, tree = _load(str(task_file), task_file.stat().st_mtime_ns)
+    except (SyntaxError, ValueError) as e:
+        print(f"❌ Помилка при розборі модуля: {e}")
+        return False
     
-    if len(found_commands) >= 5:
-        print(f"   ✅ Знайдено команди: {', '.join(found_commands)}")
-        results.append(True)
-    else:
-        print(f"   ⚠️  Знайдено лише частину команд: {', '.join(found_commands)}")
-        results.append(len(found_commands) > 3)
+    # Функції та класи верхнього рівня модуля
+    top_level_defs = {
+        node.name: node for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))
+    }
+    # Один прохід regex по файлу замість окремого пошуку кожного токена
+    tokens = set(_TOKEN_RE.findall(content))
+    
+    checks = (
+        (_check_save_data, top_level_defs),
+        (_check_load_data, top_level_defs),
+        (_check_pickle, tokens),
+        (_check_error_handling, tokens),
+        (_check_main, top_level_defs),
+        (_check_classes, top_level_defs),
+        (_check_commands, content),
+    )
+    total = len(checks)
+    # Мінімум пройдених перевірок для 85%
+    required = -(-85 * total // 100)
+    
+    passed = 0
+    run = 0
+    for check, artifact in checks:
+        run += 1
+        passed += check(artifact)
+        if fail_fast and passed + (total - run) < required:
+            print(f"\n⛔ Перевірку зупинено після {run}/{total}: оцінка ВІДМІННО вже недосяжна")
+            return False
     
     # Підсумок
-    print("\n" + "=" * 60)
+    print("\n" + _SEP)
     print("📊 РЕЗУЛЬТАТИ ВАЛІДАЦІЇ:")
-    print("=" * 60)
+    print(_SEP)
     
-    passed = sum(results)
-    total = len(results)
-    percentage = (passed / total) * 100
+    percentage = passed * 100 / run
     
     status_emoji = "✅" if percentage >= 85 else "⚠️" if percentage >= 70 else "❌"
     
@@ -186,5 +248,5 @@ def validate_hw08():
     return percentage >= 85
 
 if __name__ == "__main__":
-    success = validate_hw08()
+    success = validate_hw08(fail_fast="--fail-fast" in sys.argv[1:])
     sys.exit(0 if success else 1)
\ No newline at end of file